@@ -0,0 +1,1510 @@
+"""Numba kernels of the graphs and the constants of their buffers.
+
+Every kernel and helper is kept in this module, because numba only checks the
+source file of a cached kernel to invalidate it. A cached kernel that inlines
+a helper, or reads a constant, from another module is not recompiled when
+that module changes.
+"""
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+"""
+_NODE_EMPTY_PTR is used to fill the values of uninitialized/empty/removed nodes
+"""
+_NODE_EMPTY_PTR = -1
+
+"""
+_EDGE_EMPTY_PTR is used to fill the values of uninitialized/empty/removed edges
+"""
+_EDGE_EMPTY_PTR = -1
+
+"""
+The world to buffer indices mapping is an open addressing (linear probing)
+hash table of (world index, buffer index) rows. _HASH_EMPTY_PTR and
+_HASH_DELETED_PTR are stored as buffer index of empty and removed rows.
+"""
+_HASH_EMPTY_PTR = -1
+_HASH_DELETED_PTR = -2
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+"""
+_SCAN_SIZE is the number of edges read at once when searching a linked list
+"""
+_SCAN_SIZE = 16
+
+"""
+_COUNT_SORT_RATIO is the minimum number of nodes per request of a batch sorted
+with `np.argsort` instead of counting sort
+"""
+_COUNT_SORT_RATIO = 8
+
+"""
+_LINEAR_SEARCH_SIZE is the maximum number of requests of a single node that
+are searched linearly, larger groups are sorted and binary searched
+"""
+_LINEAR_SEARCH_SIZE = 16
+
+
+@njit(inline='always')
+def _group_by_node(nodes: np.ndarray, n_nodes: int) -> np.ndarray:
+    """Returns the order of a batch of requests that groups them by node.
+
+    Large batches are counting sorted by node in O(size + n_nodes), small
+    ones are sorted with `np.argsort` and don't allocate the node counts.
+
+    Parameters
+    ----------
+    nodes : np.ndarray
+        Buffer index of the node of each request.
+    n_nodes : int
+        Size of the nodes buffer.
+
+    Returns
+    -------
+    np.ndarray
+        Requests indices, grouped by node.
+    """
+    size = nodes.shape[0]
+    if size * _COUNT_SORT_RATIO < n_nodes:
+        return np.argsort(nodes)
+
+    offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+    for i in range(size):
+        offsets[nodes[i] + 1] += 1
+    for i in range(n_nodes):
+        offsets[i + 1] += offsets[i]
+
+    order = np.empty(size, dtype=np.int64)
+    for i in range(size):
+        order[offsets[nodes[i]]] = i
+        offsets[nodes[i]] += 1
+
+    return order
+
+
+@njit(inline='always')
+def _remove_edge(
+    node: int,
+    key: int,
+    edges_buffer: np.ndarray,
+    node2edges: np.ndarray,
+    ll_edge_pos: int,
+) -> int:
+    """Generic function to unlink a directed or undirected edge from `node`
+    linked list.
+
+    The edge isn't cleaned up nor pushed into the empty edges stack, since
+    it might still be part of other linked lists, see `_unlink_edges`.
+
+    The head is checked first, the most recently inserted edges are at the
+    head of the linked list, so removing them doesn't traverse it.
+
+    The rest of the linked list is read in blocks of `_SCAN_SIZE` edges into
+    a scratch array, which is searched for `key` with a single vectorized
+    comparison per block instead of a branch per edge.
+
+    Parameters
+    ----------
+    node : int
+        Node buffer index.
+    key : int
+        Edge index to be removed.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+    node2edges : np.ndarray
+        Mapping from node indices to edge buffer indices -- head of edges linked list.
+    ll_edge_pos : int
+        Row of the edge linked list on the edge buffer. It should be inlined
+        when compiled.
+
+    Returns
+    -------
+    int
+        Removed edge index.
+    """
+    head_idx = node2edges[node]
+    if head_idx == _EDGE_EMPTY_PTR:
+        raise ValueError("Could not find/remove edge.")
+
+    if head_idx == key:
+        node2edges[node] = edges_buffer[ll_edge_pos, head_idx]
+        return head_idx
+
+    scratch = np.empty(_SCAN_SIZE, dtype=edges_buffer.dtype)  # edges indices
+
+    idx = edges_buffer[ll_edge_pos, head_idx]
+    prev_idx = head_idx
+    n_visited = 1
+
+    # safe guard against a corrupted buffer causing an infite loop
+    while n_visited <= edges_buffer.shape[1]:
+        size = 0
+        while size < _SCAN_SIZE and idx != _EDGE_EMPTY_PTR:
+            scratch[size] = idx
+            idx = edges_buffer[ll_edge_pos, idx]
+            size += 1
+
+        if size == 0:
+            raise ValueError("Could not find/remove edge.")
+
+        found = np.argmax(scratch[:size] == key)
+
+        # edge found
+        if scratch[found] == key:
+            if found > 0:
+                prev_idx = scratch[found - 1]
+
+            next_edge_idx = edges_buffer[ll_edge_pos, scratch[found]]
+
+            # skipping found edge from linked list
+            edges_buffer[ll_edge_pos, prev_idx] = next_edge_idx
+
+            return scratch[found]
+
+        # moving to next block
+        prev_idx = scratch[size - 1]
+        n_visited += size
+
+    raise ValueError(
+        "Infinite loop detected at edge removal, edges buffer must be corrupted."
+    )
+
+
+@njit(inline='always')
+def _find_edges(
+    nodes: np.ndarray,
+    keys: np.ndarray,
+    edges_buffer: np.ndarray,
+    node2edges: np.ndarray,
+    ll_edge_pos: int,
+    key_pos: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Searches a batch of edges on the `nodes` linked lists.
+
+    Nothing is modified, so every edge of a batch can be found before any of
+    them is unlinked and a missing edge leaves the graph untouched. The
+    kept edges around each found edge are returned, so they can be unlinked
+    afterwards with `_skip_edges` without traversing the linked lists again.
+
+    The requests are grouped by node, so each linked list is traversed once.
+    Every visited edge is compared with the keys of up to
+    `_LINEAR_SEARCH_SIZE` requests of its node, larger groups are sorted by
+    key and searched (binary search) instead. Repeated requests are matched
+    to distinct edges.
+
+    Parameters
+    ----------
+    nodes : np.ndarray
+        Buffer index of the node of each linked list.
+    keys : np.ndarray
+        Value to be matched at each linked list.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+    node2edges : np.ndarray
+        Mapping from node indices to edge buffer indices -- head of edges linked list.
+    ll_edge_pos : int
+        Row of the edge linked list on the edge buffer. It should be inlined
+        when compiled.
+    key_pos : int
+        Row of the matched value on the edge buffer (e.g. 1 for the target
+        node).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Edge index found for each request, the last edge before it that is
+        kept (or -1 for the head) and the first edge after it that is kept
+        (or -1 for the tail).
+    """
+    size = nodes.shape[0]
+    found = np.empty(size, dtype=np.int64)
+    prev_edges = np.empty(size, dtype=np.int64)
+    next_edges = np.empty(size, dtype=np.int64)
+    order = _group_by_node(nodes, node2edges.shape[0])
+    max_hops = edges_buffer.shape[1]
+
+    start = 0
+    while start < size:
+        node = nodes[order[start]]
+        end = start + 1
+        while end < size and nodes[order[end]] == node:
+            end += 1
+
+        idx = node2edges[node]
+        prev_idx = _EDGE_EMPTY_PTR
+        n_hops = 0
+
+        if end - start <= _LINEAR_SEARCH_SIZE:
+            # few requests, searched linearly without allocating arrays
+            for i in range(start, end):
+                found[order[i]] = _EDGE_EMPTY_PTR
+            n_pending = end - start
+            run_size = 0  # found requests since the last kept edge
+
+            while True:
+                k = end
+                if idx != _EDGE_EMPTY_PTR and n_pending > 0:
+                    n_hops += 1
+                    if n_hops > max_hops:
+                        raise ValueError(
+                            "Infinite loop detected at edge removal, edges buffer must be corrupted."
+                        )
+
+                    # skipping requests of repeated edges that were already found
+                    key = edges_buffer[key_pos, idx]
+                    k = start
+                    while k < end and (
+                        found[order[k]] != _EDGE_EMPTY_PTR
+                        or keys[order[k]] != key
+                    ):
+                        k += 1
+
+                if k < end:
+                    found[order[k]] = idx
+                    prev_edges[order[k]] = prev_idx
+                    run_size += 1
+                    n_pending -= 1
+                else:
+                    # `idx` is kept (or the tail), it follows the current run
+                    if run_size > 0:
+                        for i in range(start, end):
+                            r = order[i]
+                            if (
+                                found[r] != _EDGE_EMPTY_PTR
+                                and prev_edges[r] == prev_idx
+                            ):
+                                next_edges[r] = idx
+                        run_size = 0
+
+                    if n_pending == 0:
+                        break
+                    if idx == _EDGE_EMPTY_PTR:
+                        raise ValueError("Could not find/remove edge.")
+                    prev_idx = idx
+
+                idx = edges_buffer[ll_edge_pos, idx]
+
+            start = end
+            continue
+
+        # requests of `node`, sorted by key
+        requests = order[start:end]
+        requests = requests[np.argsort(keys[requests], kind='mergesort')]
+        node_keys = keys[requests]
+        is_found = np.zeros(end - start, dtype=np.bool_)
+        n_pending = end - start
+
+        # found requests since the last kept edge, waiting for the next one
+        run = np.empty(end - start, dtype=np.int64)
+        run_size = 0
+
+        while idx != _EDGE_EMPTY_PTR and n_pending > 0:
+            n_hops += 1
+            if n_hops > max_hops:
+                raise ValueError(
+                    "Infinite loop detected at edge removal, edges buffer must be corrupted."
+                )
+
+            key = edges_buffer[key_pos, idx]
+
+            # skipping requests of repeated edges that were already found
+            k = np.searchsorted(node_keys, key)
+            while (
+                k < node_keys.shape[0] and node_keys[k] == key and is_found[k]
+            ):
+                k += 1
+
+            if k < node_keys.shape[0] and node_keys[k] == key:
+                is_found[k] = True
+                found[requests[k]] = idx
+                prev_edges[requests[k]] = prev_idx
+                run[run_size] = requests[k]
+                run_size += 1
+                n_pending -= 1
+            else:
+                for i in range(run_size):
+                    next_edges[run[i]] = idx
+                run_size = 0
+                prev_idx = idx
+
+            idx = edges_buffer[ll_edge_pos, idx]
+
+        if n_pending > 0:
+            raise ValueError("Could not find/remove edge.")
+
+        # every request was found, so `idx` is kept or the tail
+        for i in range(run_size):
+            next_edges[run[i]] = idx
+
+        start = end
+
+    return found, prev_edges, next_edges
+
+
+@njit(inline='always')
+def _skip_edges(
+    nodes: np.ndarray,
+    prev_edges: np.ndarray,
+    next_edges: np.ndarray,
+    edges_buffer: np.ndarray,
+    node2edges: np.ndarray,
+    ll_edge_pos: int,
+) -> None:
+    """Unlinks the edges found by `_find_edges` from the `nodes` linked lists.
+
+    Consecutive found edges share their kept edges, so each run is unlinked
+    with the same write, in any order.
+
+    Parameters
+    ----------
+    nodes : np.ndarray
+        Buffer index of the node of each linked list.
+    prev_edges : np.ndarray
+        Last kept edge before each found edge, -1 for the head.
+    next_edges : np.ndarray
+        First kept edge after each found edge, -1 for the tail.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+    node2edges : np.ndarray
+        Mapping from node indices to edge buffer indices -- head of edges linked list.
+    ll_edge_pos : int
+        Row of the edge linked list on the edge buffer. It should be inlined
+        when compiled.
+    """
+    for i in range(nodes.shape[0]):
+        if prev_edges[i] == _EDGE_EMPTY_PTR:
+            node2edges[nodes[i]] = next_edges[i]
+        else:
+            edges_buffer[ll_edge_pos, prev_edges[i]] = next_edges[i]
+
+
+@njit(inline='always')
+def _unlink_edges(
+    nodes: np.ndarray,
+    keys: np.ndarray,
+    edges_buffer: np.ndarray,
+    node2edges: np.ndarray,
+    ll_edge_pos: int,
+) -> np.ndarray:
+    """Removes a batch of edges, given by edge index, from the `nodes`
+    linked lists.
+
+    The requests are grouped by node, nodes with up to `_LINEAR_SEARCH_SIZE`
+    requests are handled by `_remove_edge`. Otherwise each linked list is
+    traversed once and every visited edge index is searched (binary search)
+    among the node requests.
+    The removed edges are only unlinked, the buffer is not cleaned up.
+
+    A missing edge raises after the edges before it were unlinked, edges
+    are first searched by value with `_find_edges`.
+
+    Parameters
+    ----------
+    nodes : np.ndarray
+        Buffer index of the node of each linked list.
+    keys : np.ndarray
+        Edge index to be removed from each linked list.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+    node2edges : np.ndarray
+        Mapping from node indices to edge buffer indices -- head of edges linked list.
+    ll_edge_pos : int
+        Row of the edge linked list on the edge buffer. It should be inlined
+        when compiled.
+
+    Returns
+    -------
+    np.ndarray
+        Edge index removed for each request.
+    """
+    size = nodes.shape[0]
+    removed = np.empty(size, dtype=np.int64)
+    order = _group_by_node(nodes, node2edges.shape[0])
+    max_hops = edges_buffer.shape[1]
+
+    start = 0
+    while start < size:
+        node = nodes[order[start]]
+        end = start + 1
+        while end < size and nodes[order[end]] == node:
+            end += 1
+
+        if end - start <= _LINEAR_SEARCH_SIZE:
+            for i in range(start, end):
+                removed[order[i]] = _remove_edge(
+                    node,
+                    keys[order[i]],
+                    edges_buffer,
+                    node2edges,
+                    ll_edge_pos,
+                )
+            start = end
+            continue
+
+        # requests of `node`, sorted by key
+        requests = order[start:end]
+        requests = requests[np.argsort(keys[requests], kind='mergesort')]
+        node_keys = keys[requests]
+        is_found = np.zeros(end - start, dtype=np.bool_)
+        n_pending = end - start
+
+        idx = node2edges[node]
+        prev_idx = _EDGE_EMPTY_PTR
+        n_hops = 0
+        while idx != _EDGE_EMPTY_PTR and n_pending > 0:
+            n_hops += 1
+            if n_hops > max_hops:
+                raise ValueError(
+                    "Infinite loop detected at edge removal, edges buffer must be corrupted."
+                )
+
+            next_edge_idx = edges_buffer[ll_edge_pos, idx]
+
+            # skipping requests of repeated edges that were already found
+            k = np.searchsorted(node_keys, idx)
+            while (
+                k < node_keys.shape[0] and node_keys[k] == idx and is_found[k]
+            ):
+                k += 1
+
+            if k < node_keys.shape[0] and node_keys[k] == idx:
+                # skipping found edge from linked list
+                if prev_idx == _EDGE_EMPTY_PTR:
+                    node2edges[node] = next_edge_idx
+                else:
+                    edges_buffer[ll_edge_pos, prev_idx] = next_edge_idx
+                is_found[k] = True
+                removed[requests[k]] = idx
+                n_pending -= 1
+            else:
+                prev_idx = idx
+
+            idx = next_edge_idx
+
+        if n_pending > 0:
+            raise ValueError("Could not find/remove edge.")
+
+        start = end
+
+    return removed
+
+
+@njit(inline='always')
+def _collect_edges(
+    idx: int,
+    edges_buffer: np.ndarray,
+    ll_edge_pos: int,
+) -> np.ndarray:
+    """Returns the edges indices of the linked list starting at `idx`.
+
+    Parameters
+    ----------
+    idx : int
+        First edge index of the linked list.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+    ll_edge_pos : int
+        Row of the edge linked list on the edge buffer. It should be inlined
+        when compiled.
+
+    Returns
+    -------
+    np.ndarray
+        Edges indices, in the linked list order.
+    """
+    first_idx = idx
+    size = 0
+    while idx != _EDGE_EMPTY_PTR:
+        size += 1
+        # safe guard against a corrupted buffer causing an infite loop
+        if size > edges_buffer.shape[1]:
+            raise ValueError(
+                "Infinite loop detected at edge iteration, edges buffer must be corrupted."
+            )
+        idx = edges_buffer[ll_edge_pos, idx]
+
+    indices = np.empty(size, dtype=np.int64)
+    idx = first_idx
+    for i in range(size):
+        indices[i] = idx
+        idx = edges_buffer[ll_edge_pos, idx]
+
+    return indices
+
+
+@njit(inline='always')
+def _pop_empty_edges(
+    empty_edges: np.ndarray,
+    n_edges: int,
+    count: int,
+) -> np.ndarray:
+    """Pops `count` edges from the top of the empty edges stack.
+
+    The stack is the array of empty edges indices, its first
+    `len(empty_edges) - n_edges` entries are in use and the top is the last
+    of them, so the stack size is not stored.
+
+    Parameters
+    ----------
+    empty_edges : np.ndarray
+        Stack of empty edges indices.
+    n_edges : int
+        Current number of edges.
+    count : int
+        Number of empty edges requested.
+
+    Returns
+    -------
+    np.ndarray
+        Array of empty edges indices, in the order they're popped.
+    """
+    top = empty_edges.shape[0] - n_edges
+    if count > top:
+        raise ValueError("Edge buffer is full.")
+
+    slots = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        slots[i] = empty_edges[top - 1 - i]
+
+    return slots
+
+
+@njit(inline='always')
+def _push_empty_edges(
+    removed: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    edges_buffer: np.ndarray,
+) -> int:
+    """Cleans up the `removed` edges and pushes them into the empty edges stack.
+
+    Parameters
+    ----------
+    removed : np.ndarray
+        Removed edges indices, already unlinked from every linked list.
+    empty_edges : np.ndarray
+        Stack of empty edges indices, see `_pop_empty_edges`.
+    n_edges : int
+        Current number of edges.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+
+    Returns
+    -------
+    int
+        New number of edges.
+    """
+    top = empty_edges.shape[0] - n_edges
+    for idx in removed:
+        # clean up not necessary but good practice
+        edges_buffer[:, idx] = _EDGE_EMPTY_PTR
+        empty_edges[top] = idx
+        top += 1
+
+    return n_edges - removed.shape[0]
+
+
+@njit(inline='always')
+def _link_edges(
+    nodes: np.ndarray,
+    slots: np.ndarray,
+    edges_buffer: np.ndarray,
+    node2edges: np.ndarray,
+    ll_edge_pos: int,
+) -> None:
+    """Inserts the edges `slots` at the head of the `nodes` linked lists.
+
+    The edges are prepended in order, it's O(E) and the resulting linked
+    lists are equal to inserting each edge sequentially. Grouping the edges
+    by node to link them in parallel requires sorting them, which costs more
+    than the two loads and stores per edge done here.
+
+    Parameters
+    ----------
+    nodes : np.ndarray
+        Buffer index of the node of each edge.
+    slots : np.ndarray
+        Edge index of each edge.
+    edges_buffer : np.ndarray
+        Buffer of edges data.
+    node2edges : np.ndarray
+        Mapping from node indices to edge buffer indices -- head of edges linked list.
+    ll_edge_pos : int
+        Row of the edge linked list on the edge buffer. It should be inlined
+        when compiled.
+    """
+    for i in range(nodes.shape[0]):
+        node = nodes[i]
+        edges_buffer[ll_edge_pos, slots[i]] = node2edges[node]
+        node2edges[node] = slots[i]
+
+
+@njit(inline='always')
+def _hash_shift(world2buffer: np.ndarray) -> int:
+    """Shift of the hashed keys, `world2buffer` length must be a power of 2."""
+    shift = 64
+    size = world2buffer.shape[0]
+    while size > 1:
+        size >>= 1
+        shift -= 1
+    return shift
+
+
+@njit(inline='always')
+def _hash_find(world2buffer: np.ndarray, key: int, shift: int) -> int:
+    """Finds the row of `key` in the `world2buffer` hash table.
+
+    If `key` is not present it returns the empty row where it should be
+    inserted. The table must always contain empty rows.
+
+    Parameters
+    ----------
+    world2buffer : np.ndarray
+        Hash table of (world index, buffer index) rows.
+    key : int
+        World index.
+    shift : int
+        Shift of the hashed keys, see `_hash_shift`.
+
+    Returns
+    -------
+    int
+        Row index of `key`.
+    """
+    key = np.int64(key)
+    mask = world2buffer.shape[0] - 1
+    # fibonacci hashing
+    row = np.int64((np.uint64(key) * _HASH_MULTIPLIER) >> np.uint64(shift))
+    while True:
+        value = world2buffer[row, 1]
+        if value == _HASH_EMPTY_PTR:
+            return row
+        if value != _HASH_DELETED_PTR and world2buffer[row, 0] == key:
+            return row
+        row = (row + 1) & mask
+
+
+@njit(inline='always')
+def _hash_get(world2buffer: np.ndarray, key: int, shift: int) -> int:
+    """Returns the `world2buffer` value of `key` (world index)."""
+    value = world2buffer[_hash_find(world2buffer, key, shift), 1]
+    if value < 0:
+        raise KeyError("Node index not found.")
+    return value
+
+
+@njit(inline='always')
+def _hash_map_keys(world2buffer: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Maps the `keys` (world indices) to their `world2buffer` values."""
+    shift = _hash_shift(world2buffer)
+    values = np.empty(keys.shape[0], dtype=np.int64)
+    for i in range(keys.shape[0]):
+        values[i] = _hash_get(world2buffer, keys[i], shift)
+    return values
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _contains_keys(
+    world2buffer: np.ndarray,
+    keys: np.ndarray,
+) -> bool:
+    """Returns true if at least one `key` is present on `world2buffer`."""
+    shift = _hash_shift(world2buffer)
+    for k in keys:
+        if world2buffer[_hash_find(world2buffer, k, shift), 1] >= 0:
+            return True
+    return False
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _update_world2buffer(
+    world2buffer: np.ndarray,
+    world_idx: np.ndarray,
+    buffer_idx: np.ndarray,
+) -> None:
+    """Updates `world_idx` (keys) and `buffer_idx` (values) to `world2buffer` mapping."""
+    shift = _hash_shift(world2buffer)
+    for i in range(world_idx.shape[0]):
+        row = _hash_find(world2buffer, world_idx[i], shift)
+        world2buffer[row, 0] = world_idx[i]
+        world2buffer[row, 1] = buffer_idx[i]
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _pop_world2buffer(world2buffer: np.ndarray, world_idx: int) -> int:
+    """Removes `world_idx` from `world2buffer` mapping and returns its buffer index."""
+    row = _hash_find(world2buffer, world_idx, _hash_shift(world2buffer))
+    buffer_idx = world2buffer[row, 1]
+    if buffer_idx < 0:
+        raise KeyError("Node index not found.")
+    world2buffer[row, 1] = _HASH_DELETED_PTR
+    return buffer_idx
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _vmap_world2buffer(
+    world2buffer: np.ndarray, world_idx: np.ndarray
+) -> np.ndarray:
+    """Maps world indices to buffer indices."""
+    return _hash_map_keys(world2buffer, world_idx)
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _gather_csr(
+    indices: np.ndarray,
+    indptr: np.ndarray,
+    rows: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Copies the `rows` of a CSR array into a new flat array and its offsets."""
+    offsets = np.empty(rows.shape[0] + 1, dtype=np.int64)
+    offsets[0] = 0
+    for i in range(rows.shape[0]):
+        offsets[i + 1] = offsets[i] + indptr[rows[i] + 1] - indptr[rows[i]]
+
+    flat = np.empty(offsets[-1], dtype=np.int64)
+    for i in range(rows.shape[0]):
+        flat[offsets[i] : offsets[i + 1]] = indices[
+            indptr[rows[i]] : indptr[rows[i] + 1]
+        ]
+
+    return flat, offsets
+
+
+"""
+Undirected edge constants for accessing the undirected graph buffer data.
+The edges buffer is a structure of arrays with _UN_EDGE_SIZE rows, each edge
+is a column and it's stored once, as (lower node, higher node) buffer
+indices.
+_LL_UN_EDGE_POS indicates the row of the lower node edges linked list, the
+higher node linked list is the row right after it.
+
+Example of an undirected graph edge buffer:
+[
+    [lower_node_buffer_id_0, lower_node_buffer_id_1, ...],
+    [higher_node_buffer_id_0, higher_node_buffer_id_1, ...],
+    [lower_edge_linked_list_0, lower_edge_linked_list_1, ...],
+    [higher_edge_linked_list_0, higher_edge_linked_list_1, ...],
+]
+"""
+_UN_EDGE_SIZE = 4
+_LL_UN_EDGE_POS = 2
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _add_undirected_edge(
+    buffer: np.ndarray,
+    node2lo_edges: np.ndarray,
+    node2hi_edges: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    world2buffer: np.ndarray,
+    src_node: int,
+    tgt_node: int,
+) -> int:
+    """Add a single edge (`src_idx`, `tgt_idx`) to `buffer`.
+
+    Update the edge linked lists (present in the buffer) of both nodes and the
+    nodes to edges mappings (head of linked lists). The nodes are given in the
+    world domain, so a single edge is inserted without building any array.
+
+    NOTE: Edges are added at the beginning of the linked list so we don't have
+    to track its tail and the operation can be done in O(1). This might
+    decrease cache hits because they're sorted in memory in the opposite
+    direction we iterate it.
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        Edges buffer.
+    node2lo_edges : np.ndarray
+        Mapping from node indices to the edges buffer indices where they're
+        the lower node -- head of edges linked list.
+    node2hi_edges : np.ndarray
+        Mapping from node indices to the edges buffer indices where they're
+        the higher node -- head of edges linked list.
+    empty_edges : np.ndarray
+        Stack of empty edges indices, see `_pop_empty_edges`.
+    n_edges : int
+        Current number of edges.
+    world2buffer : np.ndarray
+        Hash table of (world index, buffer index) rows.
+    src_node : int
+        Source node world index of added edge.
+    tgt_node : int
+        Target node world index of added edge.
+
+    Returns
+    -------
+    int
+        New number of edges.
+    """
+    top = empty_edges.shape[0] - n_edges
+    if top == 0:
+        raise ValueError("Edge buffer is full.")
+
+    shift = _hash_shift(world2buffer)
+    src_node = _hash_get(world2buffer, src_node, shift)
+    tgt_node = _hash_get(world2buffer, tgt_node, shift)
+
+    empty_idx = empty_edges[top - 1]
+
+    lo_node = min(src_node, tgt_node)
+    hi_node = max(src_node, tgt_node)
+
+    next_lo_edge = node2lo_edges[lo_node]
+    next_hi_edge = node2hi_edges[hi_node]
+    node2lo_edges[lo_node] = empty_idx
+    node2hi_edges[hi_node] = empty_idx
+
+    buffer[0, empty_idx] = lo_node
+    buffer[1, empty_idx] = hi_node
+    buffer[_LL_UN_EDGE_POS, empty_idx] = next_lo_edge
+    buffer[_LL_UN_EDGE_POS + 1, empty_idx] = next_hi_edge
+
+    return n_edges + 1
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _add_undirected_edges_batch(
+    buffer: np.ndarray,
+    edges: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    node2lo_edges: np.ndarray,
+    node2hi_edges: np.ndarray,
+) -> int:
+    """Add an array of edges into the `buffer`.
+
+    Each edge is stored once and linked to both of its nodes with
+    `_link_edges`.
+
+    The resulting buffer is equal to inserting each edge sequentially with
+    `_add_undirected_edge`.
+    """
+    size = edges.shape[0]
+    if size == 0:
+        return n_edges
+
+    slots = _pop_empty_edges(empty_edges, n_edges, size)
+
+    lo_nodes = np.minimum(edges[:, 0], edges[:, 1])
+    hi_nodes = np.maximum(edges[:, 0], edges[:, 1])
+    for i in range(size):
+        buffer[0, slots[i]] = lo_nodes[i]
+        buffer[1, slots[i]] = hi_nodes[i]
+
+    _link_edges(
+        lo_nodes,
+        slots,
+        buffer,
+        node2lo_edges,
+        _LL_UN_EDGE_POS,
+    )
+    _link_edges(
+        hi_nodes,
+        slots,
+        buffer,
+        node2hi_edges,
+        _LL_UN_EDGE_POS + 1,
+    )
+
+    return n_edges + size
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _remove_undirected_edges(
+    edges: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    edges_buffer: np.ndarray,
+    node2lo_edges: np.ndarray,
+    node2hi_edges: np.ndarray,
+) -> int:
+    """Remove an array of edges from buffer.
+
+    Every edge is searched at its lower node linked list before any of them
+    is unlinked, a missing edge raises and leaves the buffers untouched.
+    """
+    size = edges.shape[0]
+    if size == 0:
+        return n_edges
+
+    lo_nodes = np.minimum(edges[:, 0], edges[:, 1])
+    hi_nodes = np.maximum(edges[:, 0], edges[:, 1])
+
+    removed, prev_edges, next_edges = _find_edges(
+        lo_nodes,
+        hi_nodes,
+        edges_buffer,
+        node2lo_edges,
+        _LL_UN_EDGE_POS,
+        1,
+    )
+    _skip_edges(
+        lo_nodes,
+        prev_edges,
+        next_edges,
+        edges_buffer,
+        node2lo_edges,
+        _LL_UN_EDGE_POS,
+    )
+    _unlink_edges(
+        hi_nodes,
+        removed,
+        edges_buffer,
+        node2hi_edges,
+        _LL_UN_EDGE_POS + 1,
+    )
+
+    return _push_empty_edges(removed, empty_edges, n_edges, edges_buffer)
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _remove_undirected_incident_edges(
+    node: int,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    edges_buffer: np.ndarray,
+    node2lo_edges: np.ndarray,
+    node2hi_edges: np.ndarray,
+) -> int:
+    """Removes every edges that contains `node_idx`.
+
+    Both linked lists of `node` are discarded and their edges are unlinked
+    from the other nodes linked lists, traversing each one once.
+
+    Parameters
+    ----------
+    node : int
+        Node index in the buffer domain.
+    empty_edges : np.ndarray
+        Stack of empty edges indices, see `_pop_empty_edges`.
+    n_edges : int
+        Current number of total edges
+    edges_buffer : np.ndarray
+        Buffer containing the edges data
+    node2lo_edges : np.ndarray
+        Mapping from node indices to the edges buffer indices where they're
+        the lower node -- head of edges linked list.
+    node2hi_edges : np.ndarray
+        Mapping from node indices to the edges buffer indices where they're
+        the higher node -- head of edges linked list.
+
+    Returns
+    -------
+    int
+        New number of edges
+    """
+    lo_removed = _collect_edges(
+        node2lo_edges[node], edges_buffer, _LL_UN_EDGE_POS
+    )
+    hi_removed = _collect_edges(
+        node2hi_edges[node], edges_buffer, _LL_UN_EDGE_POS + 1
+    )
+    node2lo_edges[node] = _EDGE_EMPTY_PTR
+    node2hi_edges[node] = _EDGE_EMPTY_PTR
+
+    # self-loops are on both linked lists of `node`
+    hi_nodes = edges_buffer[1, lo_removed]
+    _unlink_edges(
+        hi_nodes[hi_nodes != node],
+        lo_removed[hi_nodes != node],
+        edges_buffer,
+        node2hi_edges,
+        _LL_UN_EDGE_POS + 1,
+    )
+
+    lo_nodes = edges_buffer[0, hi_removed]
+    hi_removed = hi_removed[lo_nodes != node]
+    lo_nodes = lo_nodes[lo_nodes != node]
+    _unlink_edges(
+        lo_nodes,
+        hi_removed,
+        edges_buffer,
+        node2lo_edges,
+        _LL_UN_EDGE_POS,
+    )
+
+    return _push_empty_edges(
+        np.concatenate((hi_removed, lo_removed)),
+        empty_edges,
+        n_edges,
+        edges_buffer,
+    )
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _iterate_undirected_edges(
+    world2buffer: np.ndarray,
+    world_idx: np.ndarray,
+    node2edges: np.ndarray,
+    edges_buffer: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Iterate over the lower and higher edges linked lists of each node.
+
+    The reverse edges are derived while iterating, so each returned edge
+    starts at the queried node.
+
+    Parameters
+    ----------
+    world2buffer : np.ndarray
+        Hash table of (world index, buffer index) rows.
+    world_idx : np.ndarray
+        Nodes world indices.
+    node2edges : np.ndarray
+        2 x N mapping from node indices to the heads of their lower and
+        higher edges linked lists.
+    edges_buffer : np.ndarray
+        Edges buffer.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Flat array of edges, adjacent nodes are at indices (k, k+1) such that
+        k is even, and the offsets of each node, the edges of the ith node
+        are at `flat[offsets[i] : offsets[i + 1]]`.
+    """
+    nodes = _hash_map_keys(world2buffer, world_idx)
+    n_lists = nodes.shape[0]
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+
+    for i in range(n_lists):
+        for side in range(2):
+            idx = node2edges[side, nodes[i]]
+            while idx != _EDGE_EMPTY_PTR:
+                offsets[i + 1] += 2
+                idx = edges_buffer[_LL_UN_EDGE_POS + side, idx]
+
+    offsets = np.cumsum(offsets)
+    flat = np.empty(offsets[-1], dtype=np.int64)
+
+    for i in range(n_lists):
+        k = offsets[i]
+        for side in range(2):
+            idx = node2edges[side, nodes[i]]
+            while idx != _EDGE_EMPTY_PTR:
+                flat[k] = edges_buffer[side, idx]  # queried node
+                flat[k + 1] = edges_buffer[1 - side, idx]
+                k += 2
+                idx = edges_buffer[_LL_UN_EDGE_POS + side, idx]
+
+    return flat, offsets
+
+
+"""
+Directed edge constants for accessing the directed graph buffer data.
+The edges buffer is a structure of arrays with _DI_EDGE_SIZE rows, each edge
+is a column.
+_LL_DI_EDGE_POS indicates the row of the **source** edge directed linked list,
+the target linked list is the row right after it.
+
+Example of a directed graph edge buffer:
+[
+    [source_node_buffer_id_0, source_node_buffer_id_1, ...],
+    [target_node_buffer_id_0, target_node_buffer_id_1, ...],
+    [source_edge_linked_list_0, source_edge_linked_list_1, ...],
+    [target_edge_linked_List_0, target_edge_linked_List_1, ...],
+]
+"""
+_DI_EDGE_SIZE = _UN_EDGE_SIZE
+_LL_DI_EDGE_POS = 2
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _add_directed_edge(
+    buffer: np.ndarray,
+    node2src_edges: np.ndarray,
+    node2tgt_edges: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    world2buffer: np.ndarray,
+    src_node: int,
+    tgt_node: int,
+) -> int:
+    """Add a single directed edge to `buffer`.
+
+    This updates the `buffer`'s source and target linked list
+    and the nodes to edges mappings.
+
+    NOTE: see `_add_undirected_edge` docs for comment about cache misses.
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        Edges buffer.
+    node2src_edges : np.ndarray
+        Mapping from node indices to source edge buffer indices -- head of edges linked list.
+    node2tgt_edges : np.ndarray
+        Mapping from node indices to target edge buffer indices -- head of edges linked list.
+    empty_edges : np.ndarray
+        Stack of empty edges indices, see `_pop_empty_edges`.
+    n_edges : int
+        Current number of edges.
+    world2buffer : np.ndarray
+        Hash table of (world index, buffer index) rows.
+    src_node : int
+        Source node world index of added edge.
+    tgt_node : int
+        Target node world index of added edge.
+
+    Returns
+    -------
+    int
+        New number of edges.
+    """
+    top = empty_edges.shape[0] - n_edges
+    if top == 0:
+        raise ValueError("Edge buffer is full.")
+
+    shift = _hash_shift(world2buffer)
+    src_node = _hash_get(world2buffer, src_node, shift)
+    tgt_node = _hash_get(world2buffer, tgt_node, shift)
+
+    empty_idx = empty_edges[top - 1]
+
+    next_src_edge = node2src_edges[src_node]
+    next_tgt_edge = node2tgt_edges[tgt_node]
+    node2src_edges[src_node] = empty_idx
+    node2tgt_edges[tgt_node] = empty_idx
+
+    buffer[0, empty_idx] = src_node
+    buffer[1, empty_idx] = tgt_node
+    buffer[_LL_DI_EDGE_POS, empty_idx] = next_src_edge
+    buffer[_LL_DI_EDGE_POS + 1, empty_idx] = next_tgt_edge
+
+    return n_edges + 1
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _add_directed_edges(
+    buffer: np.ndarray,
+    edges: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    node2src_edges: np.ndarray,
+    node2tgt_edges: np.ndarray,
+) -> int:
+    """Add an array of edges into the `buffer`.
+
+    Directed edges contains two linked lists, outgoing (source) and incoming
+    (target) edges, each edge is written and prepended to both of them in a
+    single pass over the batch.
+
+    The resulting buffer is equal to inserting each edge sequentially with
+    `_add_directed_edge`.
+    """
+    size = edges.shape[0]
+    if size == 0:
+        return n_edges
+
+    slots = _pop_empty_edges(empty_edges, n_edges, size)
+
+    for i in range(size):
+        src_node = edges[i, 0]
+        tgt_node = edges[i, 1]
+        idx = slots[i]
+        buffer[0, idx] = src_node
+        buffer[1, idx] = tgt_node
+        buffer[_LL_DI_EDGE_POS, idx] = node2src_edges[src_node]
+        buffer[_LL_DI_EDGE_POS + 1, idx] = node2tgt_edges[tgt_node]
+        node2src_edges[src_node] = idx
+        node2tgt_edges[tgt_node] = idx
+
+    return n_edges + size
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _remove_directed_edges(
+    edges: np.ndarray,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    edges_buffer: np.ndarray,
+    node2src_edges: np.ndarray,
+    node2tgt_edges: np.ndarray,
+) -> int:
+    """Remove an array of edges from the edges buffer.
+
+    Every edge is searched at its source linked list before any of them is
+    unlinked, a missing edge raises and leaves the buffers untouched.
+    """
+    size = edges.shape[0]
+    if size == 0:
+        return n_edges
+
+    src_nodes = edges[:, 0].copy()
+    tgt_nodes = edges[:, 1].copy()
+
+    removed, prev_edges, next_edges = _find_edges(
+        src_nodes,
+        tgt_nodes,
+        edges_buffer,
+        node2src_edges,
+        _LL_DI_EDGE_POS,
+        1,
+    )
+    _skip_edges(
+        src_nodes,
+        prev_edges,
+        next_edges,
+        edges_buffer,
+        node2src_edges,
+        _LL_DI_EDGE_POS,
+    )
+    _unlink_edges(
+        tgt_nodes,
+        removed,
+        edges_buffer,
+        node2tgt_edges,
+        _LL_DI_EDGE_POS + 1,
+    )
+
+    return _push_empty_edges(removed, empty_edges, n_edges, edges_buffer)
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _remove_directed_incident_edges(
+    node: int,
+    empty_edges: np.ndarray,
+    n_edges: int,
+    edges_buffer: np.ndarray,
+    node2src_edges: np.ndarray,
+    node2tgt_edges: np.ndarray,
+) -> int:
+    """Remove directed edges from the buffer that contain the given `node`.
+
+    The source and target linked lists of `node` are discarded and their
+    edges are unlinked from the other nodes linked lists, traversing each one
+    once.
+
+    Parameters
+    ----------
+    node : int
+        Node index in the buffer domain.
+    empty_edges : np.ndarray
+        Stack of empty edges indices, see `_pop_empty_edges`.
+    n_edges : int
+        Current number of total edges
+    edges_buffer : np.ndarray
+        Buffer containing the edges data
+    node2src_edges : np.ndarray
+        Mapping from node indices to source edge buffer indices -- head of edges linked list.
+    node2tgt_edges : np.ndarray
+        Mapping from node indices to target edge buffer indices -- head of edges linked list.
+
+    Returns
+    -------
+    int
+        New number of edges
+    """
+    src_removed = _collect_edges(
+        node2src_edges[node], edges_buffer, _LL_DI_EDGE_POS
+    )
+    tgt_removed = _collect_edges(
+        node2tgt_edges[node], edges_buffer, _LL_DI_EDGE_POS + 1
+    )
+    node2src_edges[node] = _EDGE_EMPTY_PTR
+    node2tgt_edges[node] = _EDGE_EMPTY_PTR
+
+    # self-loops are on both linked lists of `node`
+    tgt_nodes = edges_buffer[1, src_removed]
+    _unlink_edges(
+        tgt_nodes[tgt_nodes != node],
+        src_removed[tgt_nodes != node],
+        edges_buffer,
+        node2tgt_edges,
+        _LL_DI_EDGE_POS + 1,
+    )
+
+    src_nodes = edges_buffer[0, tgt_removed]
+    tgt_removed = tgt_removed[src_nodes != node]
+    src_nodes = src_nodes[src_nodes != node]
+    _unlink_edges(
+        src_nodes,
+        tgt_removed,
+        edges_buffer,
+        node2src_edges,
+        _LL_DI_EDGE_POS,
+    )
+
+    return _push_empty_edges(
+        np.concatenate((tgt_removed, src_removed)),
+        empty_edges,
+        n_edges,
+        edges_buffer,
+    )
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _iterate_directed_source_edges(
+    world2buffer: np.ndarray,
+    world_idx: np.ndarray,
+    node2edges: np.ndarray,
+    edges_buffer: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Iterate over the source (outgoing) edges linked lists of each node.
+
+    The first pass counts the edges of each linked list and the second one
+    copies them into a single flat array.
+
+    Parameters
+    ----------
+    world2buffer : np.ndarray
+        Hash table of (world index, buffer index) rows.
+    world_idx : np.ndarray
+        Nodes world indices.
+    node2edges : np.ndarray
+        Mapping from node indices to source edge buffer indices -- head of edges linked list.
+    edges_buffer : np.ndarray
+        Edges buffer.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Flat array of edges, adjacent nodes are at indices (k, k+1) such that
+        k is even, and the offsets of each node, the edges of the ith node
+        are at `flat[offsets[i] : offsets[i + 1]]`.
+    """
+    nodes = _hash_map_keys(world2buffer, world_idx)
+    n_lists = nodes.shape[0]
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+
+    for i in range(n_lists):
+        idx = node2edges[nodes[i]]
+        while idx != _EDGE_EMPTY_PTR:
+            offsets[i + 1] += 2
+            idx = edges_buffer[_LL_DI_EDGE_POS, idx]
+
+    offsets = np.cumsum(offsets)
+    flat = np.empty(offsets[-1], dtype=np.int64)
+
+    for i in range(n_lists):
+        idx = node2edges[nodes[i]]
+        k = offsets[i]
+        while idx != _EDGE_EMPTY_PTR:
+            flat[k] = edges_buffer[0, idx]  # src
+            flat[k + 1] = edges_buffer[1, idx]  # tgt
+            k += 2
+            idx = edges_buffer[_LL_DI_EDGE_POS, idx]
+
+    return flat, offsets
+
+
+@njit(
+    cache=True,
+    boundscheck=False,
+    error_model='numpy',
+)
+def _iterate_directed_target_edges(
+    world2buffer: np.ndarray,
+    world_idx: np.ndarray,
+    node2edges: np.ndarray,
+    edges_buffer: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Iterate over the target (incoming) edges linked lists of each node.
+
+    The first pass counts the edges of each linked list and the second one
+    copies them into a single flat array.
+
+    Parameters
+    ----------
+    world2buffer : np.ndarray
+        Hash table of (world index, buffer index) rows.
+    world_idx : np.ndarray
+        Nodes world indices.
+    node2edges : np.ndarray
+        Mapping from node indices to target edge buffer indices -- head of edges linked list.
+    edges_buffer : np.ndarray
+        Edges buffer.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Flat array of edges, adjacent nodes are at indices (k, k+1) such that
+        k is even, and the offsets of each node, the edges of the ith node
+        are at `flat[offsets[i] : offsets[i + 1]]`.
+    """
+    nodes = _hash_map_keys(world2buffer, world_idx)
+    n_lists = nodes.shape[0]
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+
+    for i in range(n_lists):
+        idx = node2edges[nodes[i]]
+        while idx != _EDGE_EMPTY_PTR:
+            offsets[i + 1] += 2
+            idx = edges_buffer[_LL_DI_EDGE_POS + 1, idx]
+
+    offsets = np.cumsum(offsets)
+    flat = np.empty(offsets[-1], dtype=np.int64)
+
+    for i in range(n_lists):
+        idx = node2edges[nodes[i]]
+        k = offsets[i]
+        while idx != _EDGE_EMPTY_PTR:
+            flat[k] = edges_buffer[0, idx]  # src
+            flat[k + 1] = edges_buffer[1, idx]  # tgt
+            k += 2
+            idx = edges_buffer[_LL_DI_EDGE_POS + 1, idx]
+
+    return flat, offsets
@@ -7,8 +7,7 @@ import pytest
 from numpy.typing import ArrayLike
 
 from napari_graph import DirectedGraph, UndirectedGraph
-from napari_graph.base_graph import _EDGE_EMPTY_PTR, BaseGraph
-from napari_graph.undirected_graph import _LL_UN_EDGE_POS, _UN_EDGE_SIZE
+from napari_graph.base_graph import BaseGraph
 
 
 @pytest.mark.parametrize("n_prealloc_edges", [0, 2, 5])
@@ -75,6 +74,213 @@ def test_directed_edge_addition(n_prealloc_edges: int) -> None:
     assert np.all(target_edges == edges[:, np.newaxis, :])
 
 
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_batch_edge_addition(graph_type: Type[BaseGraph]) -> None:
+    # batch insertion must match inserting each edge sequentially
+    n_nodes = 20
+    rng = np.random.default_rng(0)
+    edges = rng.integers(n_nodes, size=(100, 2))
+
+    graph = graph_type(n_nodes=n_nodes, n_edges=len(edges))
+    graph.add_nodes(count=n_nodes)
+    graph.add_edges(edges)
+
+    expected = graph_type(n_nodes=n_nodes, n_edges=len(edges))
+    expected.add_nodes(count=n_nodes)
+    for edge in edges:
+        expected.add_edges(edge)
+
+    for name in graph._INDEX_BUFFERS:
+        np.testing.assert_array_equal(
+            getattr(graph, name), getattr(expected, name)
+        )
+    assert graph.n_edges == expected.n_edges == len(edges)
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_single_edge_addition(graph_type: Type[BaseGraph]) -> None:
+    graph = graph_type(edges=[[0, 1]])
+    graph.add_nodes(indices=[5])
+
+    graph.add_edges((5, 1))
+    graph.add_edges([0, np.int32(5)])
+
+    expected = graph_type(edges=[[0, 1]])
+    expected.add_nodes(indices=[5])
+    expected.add_edges([[5, 1], [0, 5]])
+
+    # empty edges of the reallocated buffer are not initialized
+    for result, desired in zip(
+        graph.get_edges_buffers(), expected.get_edges_buffers()
+    ):
+        np.testing.assert_array_equal(result, desired)
+    for result, desired in zip(graph.get_edges(), expected.get_edges()):
+        np.testing.assert_array_equal(result, desired)
+    assert graph.n_edges == 3
+
+    with pytest.raises(KeyError):
+        graph.add_edges((0, 2))
+    assert graph.n_edges == 3
+
+    # bool is a subclass of int, but it's not a node index
+    for edge in [(True, False), [np.bool_(True), np.bool_(False)]]:
+        with pytest.raises(ValueError, match="Edges must be integer"):
+            graph.add_edges(edge)
+    assert graph.n_edges == 3
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_high_degree_edge_removal(graph_type: Type[BaseGraph]) -> None:
+    # star graph, hub's linked list is longer than a single search block
+    n_leaves = 50
+    edges = np.stack(
+        [np.zeros(n_leaves, dtype=int), np.arange(1, n_leaves + 1)], axis=1
+    )
+    graph = graph_type(edges=edges, n_nodes=n_leaves + 1)
+
+    rng = np.random.default_rng(0)
+    removed = rng.permutation(n_leaves)[:30]
+    for i in removed:
+        graph.remove_edges(edges[i])
+
+    remaining = np.delete(edges, removed, axis=0)
+    hub_edges = (
+        graph.get_edges(0)
+        if graph_type is UndirectedGraph
+        else graph.get_source_edges(0)
+    )
+    np.testing.assert_array_equal(np.sort(hub_edges[:, 1]), remaining[:, 1])
+    assert graph.n_edges == len(remaining)
+
+    with pytest.raises(ValueError):
+        graph.remove_edges(edges[removed[0]])
+
+
+@pytest.mark.parametrize("n_nodes", [51, 1000])
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_high_degree_batch_edge_removal(
+    graph_type: Type[BaseGraph], n_nodes: int
+) -> None:
+    # hub requests are more than a linear search, batches are grouped with
+    # counting sort or argsort depending on the number of nodes
+    n_leaves = 50
+    edges = np.stack(
+        [np.zeros(n_leaves, dtype=int), np.arange(1, n_leaves + 1)], axis=1
+    )
+    graph = graph_type(n_nodes=n_nodes)
+    graph.add_nodes(count=n_nodes)
+    graph.add_edges(edges)
+
+    removed = np.random.default_rng(0).permutation(n_leaves)[:30]
+    graph.remove_edges(edges[removed])
+
+    remaining = np.delete(edges, removed, axis=0)
+    hub_edges = (
+        graph.get_edges(0)
+        if graph_type is UndirectedGraph
+        else graph.get_source_edges(0)
+    )
+    np.testing.assert_array_equal(np.sort(hub_edges[:, 1]), remaining[:, 1])
+    assert graph.n_edges == len(remaining)
+
+    graph.remove_edges(remaining)
+    assert graph.n_edges == 0
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_batch_edge_removal(graph_type: Type[BaseGraph]) -> None:
+    # multigraph with repeated edges and self-loops
+    n_nodes = 30
+    rng = np.random.default_rng(0)
+    edges = rng.integers(n_nodes, size=(200, 2))
+    edges[:20] = edges[20:40]
+
+    graph = graph_type(n_nodes=n_nodes)
+    graph.add_nodes(count=n_nodes)
+    graph.add_edges(edges)
+
+    removed = rng.permutation(len(edges))[:120]
+    graph.remove_edges(edges[removed])
+    remaining = np.delete(edges, removed, axis=0)
+
+    def _sorted_rows(array: np.ndarray) -> np.ndarray:
+        if graph_type is UndirectedGraph:
+            array = np.sort(array, axis=1)
+        return array[np.lexsort(array.T[::-1])]
+
+    assert graph.n_edges == len(remaining)
+    _, buffer_edges = graph.get_edges_buffers()
+    np.testing.assert_array_equal(
+        _sorted_rows(buffer_edges), _sorted_rows(remaining)
+    )
+
+    if graph_type is UndirectedGraph:
+        iterated_edges = np.concatenate(graph.get_edges(), axis=0)
+        np.testing.assert_array_equal(
+            _sorted_rows(iterated_edges),
+            _sorted_rows(np.concatenate([remaining, remaining[:, ::-1]])),
+        )
+    else:
+        for iterated_edges in (
+            graph.get_source_edges(),
+            graph.get_target_edges(),
+        ):
+            np.testing.assert_array_equal(
+                _sorted_rows(np.concatenate(iterated_edges, axis=0)),
+                _sorted_rows(remaining),
+            )
+
+    with pytest.raises(ValueError):
+        graph.remove_edges([[0, 0], [0, 0], [0, 0], [0, 0]])
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_failed_batch_edge_removal(graph_type: Type[BaseGraph]) -> None:
+    graph = graph_type(edges=[[0, 1], [2, 3], [1, 2]])
+
+    def _state() -> List[np.ndarray]:
+        state = list(graph.get_edges_buffers())
+        if graph_type is UndirectedGraph:
+            state += graph.get_edges()
+        else:
+            state += graph.get_source_edges() + graph.get_target_edges()
+        return state
+
+    expected = _state()
+
+    # (0, 3) is missing, (0, 1) must not be removed
+    with pytest.raises(ValueError):
+        graph.remove_edges([[0, 1], [0, 3]])
+
+    assert graph.n_edges == 3
+    for array, expected_array in zip(_state(), expected):
+        np.testing.assert_array_equal(array, expected_array)
+
+    graph.remove_node(1)
+    assert graph.n_edges == 1
+    _, buffer_edges = graph.get_edges_buffers()
+    np.testing.assert_array_equal(buffer_edges, [[2, 3]])
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_incident_edges_removal(graph_type: Type[BaseGraph]) -> None:
+    # repeated edges and self-loops on the removed node
+    edges = np.asarray(
+        [[0, 1], [1, 0], [0, 1], [0, 0], [0, 0], [2, 0], [1, 2], [2, 2]]
+    )
+    graph = graph_type(n_nodes=3, n_edges=len(edges))
+    graph.add_nodes(count=3)
+    graph.add_edges(edges)
+
+    graph.remove_node(0)
+
+    assert graph.n_edges == 2
+    _, buffer_edges = graph.get_edges_buffers()
+    np.testing.assert_array_equal(
+        buffer_edges[np.argsort(buffer_edges[:, 0])], [[1, 2], [2, 2]]
+    )
+
+
 @pytest.mark.parametrize("n_prealloc_nodes", [0, 3, 6, 12])
 def test_node_addition_indices_coords(n_prealloc_nodes: int) -> None:
     # test node addition with indices and coords and different pre-allocation size
@@ -96,6 +302,102 @@ def test_node_addition_indices_coords(n_prealloc_nodes: int) -> None:
     )
 
 
+def test_world2buffer_map() -> None:
+    # enough nodes to rehash the table and reuse removed rows
+    rng = np.random.default_rng(0)
+    indices = rng.choice(2**40, size=500, replace=False)
+
+    graph = UndirectedGraph(n_nodes=len(indices), n_edges=1)
+    graph.add_nodes(indices=indices[:10])
+    graph.add_nodes(indices=indices[10:])
+
+    buffer_indices = graph._map_world2buffer(indices)
+    np.testing.assert_array_equal(graph._buffer2world[buffer_indices], indices)
+
+    for index in indices[:100]:
+        graph.remove_node(index)
+
+    with pytest.raises(KeyError):
+        graph._map_world2buffer(indices[:1])
+
+    graph.add_nodes(indices=indices[:100])
+    buffer_indices = graph._map_world2buffer(indices)
+    np.testing.assert_array_equal(graph._buffer2world[buffer_indices], indices)
+
+
+def test_node_buffers_realloc() -> None:
+    # empty nodes allocated before reallocation must be kept
+    graph = DirectedGraph(n_nodes=5)
+    graph.add_nodes(count=3)
+    graph.add_nodes(count=30)
+
+    assert len(graph) == 33
+    np.testing.assert_array_equal(graph.get_nodes(), np.arange(33))
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_edges_buffer_realloc(graph_type: Type[BaseGraph]) -> None:
+    n_nodes = 100
+    graph = graph_type(n_nodes=n_nodes)
+    graph.add_nodes(count=n_nodes)
+
+    edges = np.stack(
+        [np.arange(n_nodes), np.roll(np.arange(n_nodes), 1)], axis=1
+    )
+    n_reallocs = 0
+    for edge in edges:
+        n_allocated_edges = graph.n_allocated_edges
+        graph.add_edges(edge)
+        n_reallocs += n_allocated_edges != graph.n_allocated_edges
+
+    # geometric growth
+    assert n_reallocs <= 4
+    n_allocated_edges = graph.n_allocated_edges
+    assert n_allocated_edges & (n_allocated_edges - 1) == 0
+    assert graph.n_edges == n_nodes
+
+    if graph_type is UndirectedGraph:
+        # undirected edges are stored as (lower, higher) nodes
+        edges = np.sort(edges, axis=1)
+
+    _, buffer_edges = graph.get_edges_buffers()
+    np.testing.assert_array_equal(buffer_edges, edges)
+
+
+@pytest.mark.parametrize("graph_type", [UndirectedGraph, DirectedGraph])
+def test_index_dtype_promotion(graph_type: Type[BaseGraph]) -> None:
+    n_nodes = 20
+    rng = np.random.default_rng(0)
+    edges = rng.integers(n_nodes, size=(50, 2))
+
+    graphs = []
+    for promote in (False, True):
+        graph = graph_type(n_nodes=n_nodes, n_edges=len(edges))
+        assert graph._edges_buffer.dtype == np.int32
+        if promote:
+            # same as having more than 2^31 nodes or edges
+            graph._promote_index_dtype(2**31)
+            for name in graph._INDEX_BUFFERS:
+                assert getattr(graph, name).dtype == np.int64
+
+        graph.add_nodes(count=n_nodes)
+        graph.add_edges(edges)
+        graph.remove_edges(edges[:10])
+        graph.remove_node(0)
+        graph.add_nodes(count=n_nodes)  # realloc keeps the data type
+        graphs.append(graph)
+
+    int32_graph, int64_graph = graphs
+    assert int64_graph._node2edges.dtype == np.int64
+    np.testing.assert_array_equal(
+        int32_graph.get_edges_buffers()[1], int64_graph.get_edges_buffers()[1]
+    )
+    for node_edges, expected in zip(
+        int64_graph.get_edges(), int32_graph.get_edges()
+    ):
+        np.testing.assert_array_equal(node_edges, expected)
+
+
 def test_node_addition_non_spatial() -> None:
     graph = DirectedGraph()
 
@@ -203,16 +505,55 @@ class TestGraph:
         valid_edges = np.logical_not(np.any(self.edges == node_id, axis=1))
 
         expected_edges = self.edges[valid_edges, :]
+        if self._GRAPH_CLASS is UndirectedGraph:
+            # undirected edges are stored as (lower, higher) nodes
+            expected_edges = np.sort(expected_edges, axis=1)
         (expected_indices,) = np.nonzero(valid_edges)
-        expected_indices *= (
-            self.graph._EDGE_SIZE * self.graph._EDGE_DUPLICATION
-        )
 
         indices, edges = self.graph.get_edges_buffers()
 
         assert np.allclose(expected_indices, indices)
         assert np.allclose(expected_edges, edges)
 
+    def test_frozen_edges(self) -> None:
+        nodes = self.graph.get_nodes()
+        expected = [self.graph.get_edges(node) for node in nodes]
+        assert not self.graph._frozen_edges
+
+        # querying every node builds the CSR, used by later queries
+        for node_edges, edges in zip(self.graph.get_edges(), expected):
+            np.testing.assert_array_equal(node_edges, edges)
+        assert self.graph._frozen_edges
+
+        for node, edges in zip(nodes, expected):
+            np.testing.assert_array_equal(self.graph.get_edges(node), edges)
+
+        self.graph.remove_edges(self.edges[0])
+        assert not self.graph._frozen_edges
+        assert not self.contains(self.edges[0], self.graph.get_edges())
+
+        # removed nodes are empty rows of the CSR between the other nodes
+        self.graph.remove_node(nodes[1])
+        nodes = self.graph.get_nodes()
+        expected = [self.graph.get_edges(node) for node in nodes]
+        all_edges = self.graph.get_edges()
+        assert len(all_edges) == len(expected)
+        for node_edges, edges in zip(all_edges, expected):
+            np.testing.assert_array_equal(node_edges, edges)
+
+    def test_flat_edges(self) -> None:
+        self.graph.remove_edges(self.edges[0])
+        nodes = self.graph.get_nodes()[::-1]
+
+        for mode in ('indices', 'coords'):
+            expected = self.graph.get_edges(nodes, mode=mode)
+            edges, offsets = self.graph.get_edges(nodes, mode=mode, flat=True)
+            assert len(offsets) == len(nodes) + 1
+            for i, node_edges in enumerate(expected):
+                np.testing.assert_array_equal(
+                    edges[offsets[i] : offsets[i + 1]], node_edges
+                )
+
     def test_subgraph_edges(self) -> None:
         # 3 is disconnected in subgraph
         nodes_ids = np.asarray([0, 1, 3]) + self._index_shift
@@ -306,8 +647,6 @@ class TestUndirectedGraph(TestGraph):
 
         assert self.graph.n_allocated_edges == 5
 
-        self.assert_empty_linked_list_pairs_are_neighbors()
-
     def test_node_removal(self) -> None:
         nodes = np.asarray([3, 4, 1]) + self._index_shift
         original_size = len(self.graph)
@@ -322,8 +661,6 @@ class TestUndirectedGraph(TestGraph):
             assert node not in self.graph.get_nodes()
             assert len(self.graph) == original_size - i - 1
 
-        self.assert_empty_linked_list_pairs_are_neighbors()
-
     def test_edge_coordinates(self) -> None:
         edge_coords = self.graph.get_edges(mode='coords')
 
@@ -333,19 +670,6 @@ class TestUndirectedGraph(TestGraph):
                     self.coords.loc[edge, ["y", "x"]].to_numpy(), coords[i]
                 )
 
-    def assert_empty_linked_list_pairs_are_neighbors(self) -> None:
-        # testing if empty edges linked list pairs are neighbors
-        empty_idx = self.graph._empty_edge_idx
-        while empty_idx != _EDGE_EMPTY_PTR:
-            next_empty_idx = self.graph._edges_buffer[
-                empty_idx * _UN_EDGE_SIZE + _LL_UN_EDGE_POS
-            ]
-            assert empty_idx + 1 == next_empty_idx
-            # skipping one
-            empty_idx = self.graph._edges_buffer[
-                next_empty_idx * _UN_EDGE_SIZE + _LL_UN_EDGE_POS
-            ]
-
 
 class NonSpatialMixin(Protocol):
     # required by typing
@@ -1,177 +1,23 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
 
 import networkx as nx
 import numpy as np
 import pandas as pd
-from numba import njit, typed
-from numba.core import types
 from numpy.typing import ArrayLike
 
-"""
-_NODE_EMPTY_PTR is used to fill the values of uninitialized/empty/removed nodes
-"""
-_NODE_EMPTY_PTR = -1
-
-"""
-_EDGE_EMPTY_PTR is used to fill the values of uninitialized/empty/removed edges
-"""
-_EDGE_EMPTY_PTR = -1
-
-
-@njit(inline='always')
-def _remove_edge(
-    src_node: int,
-    tgt_node: int,
-    empty_idx: int,
-    edges_buffer: np.ndarray,
-    node2edges: np.ndarray,
-    edge_size: int,
-    ll_edge_pos: int,
-) -> int:
-    """Generic function to remove directed or undirected nodes.
-
-    An additional removal of the target edges linked list is necessary for
-    directed edges.
-
-    Parameters
-    ----------
-    src_node : int
-        Source node buffer index.
-    tgt_node : int
-        Target node buffer index.
-    empty_idx : int
-        First index of empty edges linked list.
-    edges_buffer : np.ndarray
-        Buffer of edges data.
-    node2edges : np.ndarray
-        Mapping from node indices to edge buffer indices -- head of edges linked list.
-    edge_size : int
-        Size of the edges on the buffer. It should be inlined when compiled.
-    ll_edge_pos : int
-        Position (shift) of the edge linked list on the edge buffer. It should
-        be inlined when compiled.
-
-    Returns
-    -------
-    int
-        New first index of empty edges linked list.
-    """
-
-    idx = node2edges[src_node]
-    prev_buffer_idx = _EDGE_EMPTY_PTR
-
-    # safe guard against a corrupted buffer causing an infite loop
-    for _ in range(edges_buffer.shape[0] // edge_size):
-        if idx == _EDGE_EMPTY_PTR:
-            raise ValueError("Could not find/remove edge.")
-
-        buffer_idx = idx * edge_size
-        next_edge_idx = edges_buffer[buffer_idx + ll_edge_pos]
-
-        # edge found
-        if edges_buffer[buffer_idx + 1] == tgt_node:
-            # skipping found edge from linked list
-            if prev_buffer_idx == _EDGE_EMPTY_PTR:
-                node2edges[src_node] = next_edge_idx
-            else:
-                edges_buffer[prev_buffer_idx + ll_edge_pos] = next_edge_idx
-
-            # clean up not necessary but good practice
-            edges_buffer[buffer_idx : buffer_idx + edge_size] = _EDGE_EMPTY_PTR
-            edges_buffer[buffer_idx + ll_edge_pos] = empty_idx
-
-            break
-
-        # moving to next edge
-        idx = next_edge_idx
-        prev_buffer_idx = buffer_idx
-    else:
-        raise ValueError(
-            "Infinite loop detected at edge removal, edges buffer must be corrupted."
-        )
-
-    return idx
-
-
-@njit(inline='always')
-def _iterate_edges(
-    edge_ptr_indices: np.ndarray,
-    edges_buffer: np.ndarray,
-    edge_size: int,
-    ll_edge_pos: int,
-) -> typed.List:
-    """Iterate over the edges linked lists given their starting edges.
-
-    It returns list of multiplicity 2, where each pair is an edge.
-
-    Parameters
-    ----------
-    edge_ptr_indices : np.ndarray
-        Array of starting indices.
-    edges_buffer : np.ndarray
-        Edges buffer.
-    edge_size : int
-        Size of the edges on the buffer. It should be inlined when compiled.
-    ll_edge_pos : int
-        Position (shift) of the edge linked list on the edge buffer. It should
-        be inlined when compiled.
-
-    Returns
-    -------
-    typed.List
-        List of lists edges, adjacent nodes are at indices (k, k+1) such that k
-        is even.
-    """
-    edges_list = typed.List()
-
-    for idx in edge_ptr_indices:
-        edges = typed.List.empty_list(types.int64)
-        edges_list.append(edges)
-
-        while idx != _EDGE_EMPTY_PTR:
-            buffer_idx = idx * edge_size
-            edges.append(edges_buffer[buffer_idx])  # src
-            edges.append(edges_buffer[buffer_idx + 1])  # tgt
-            idx = edges_buffer[buffer_idx + ll_edge_pos]
-
-    return edges_list
-
-
-@njit
-def _contains_keys(
-    map: typed.Dict,
-    keys: np.ndarray,
-) -> bool:
-    """Returns true if at least one `key` is present on `map`."""
-    for k in keys:
-        if k in map:
-            return True
-    return False
-
-
-@njit
-def _update_world2buffer(
-    world2buffer: typed.Dict,
-    world_idx: np.ndarray,
-    buffer_idx: np.ndarray,
-) -> None:
-    """Updates `world_idx` (keys) and `buffer_idx` (values) to `world2buffer` mapping."""
-    for w, b in zip(world_idx, buffer_idx):
-        world2buffer[w] = b
-
-
-@njit
-def _vmap_world2buffer(
-    world2buffer: typed.Dict, world_idx: np.ndarray
-) -> typed.Dict:
-    """Maps world indices to buffer indices."""
-    buffer_idx = np.empty(world_idx.shape[0], dtype=types.int64)
-    for i in range(world_idx.shape[0]):
-        buffer_idx[i] = world2buffer[world_idx[i]]
-    return buffer_idx
+from napari_graph._kernels import (
+    _EDGE_EMPTY_PTR,
+    _HASH_EMPTY_PTR,
+    _NODE_EMPTY_PTR,
+    _contains_keys,
+    _gather_csr,
+    _pop_world2buffer,
+    _update_world2buffer,
+    _vmap_world2buffer,
+)
 
 
 class BaseGraph:
@@ -192,14 +38,20 @@ class BaseGraph:
     """
 
     # abstract constants
-    _EDGE_DUPLICATION: int
     _EDGE_SIZE: int
-    _LL_EDGE_POS: int
 
     # allocation constants
     _ALLOC_MULTIPLIER = 1.1
     _ALLOC_MIN = 25
 
+    # buffers of nodes and edges buffer indices, see `_promote_index_dtype`
+    _INDEX_DTYPE: Type[np.signedinteger] = np.int32
+    _INDEX_BUFFERS: Tuple[str, ...] = (
+        '_node2edges',
+        '_edges_buffer',
+        '_empty_edges',
+    )
+
     def __init__(
         self,
         edges: ArrayLike = (),
@@ -208,10 +60,14 @@ class BaseGraph:
         n_nodes: Optional[int] = None,
         n_edges: Optional[int] = None,
     ):
+        # CSR copies of the edges linked lists, see `_freeze`
+        self._frozen_edges: Dict[Callable, Tuple[np.ndarray, np.ndarray]] = {}
+        self._index_dtype = self._INDEX_DTYPE
+
         # validate nodes
         if coords is not None:
             if not isinstance(coords, pd.DataFrame):
-                coords = pd.DataFrame(coords)
+                coords = pd.DataFrame(coords, copy=False)
             if not np.issubdtype(coords.index.dtype, np.integer):
                 raise ValueError(
                     f"The index of `coords` (data type: {coords.index.dtype}) must be an integer."
@@ -248,7 +104,11 @@ class BaseGraph:
 
         if coords is not None:
             assert self._coords is not None
-            self.add_nodes(indices=coords.index, coords=coords)
+            # casting once, it's a view when `coords` is already float32
+            self.add_nodes(
+                indices=coords.index,
+                coords=coords.to_numpy(dtype=self._coords.dtype, copy=False),
+            )
 
         # validate edges
         edges = np.asarray(edges)
@@ -278,27 +138,89 @@ class BaseGraph:
                 self.add_nodes(indices=np.unique(edges))
             self.add_edges(edges)
 
+    def _promote_index_dtype(self, size: int) -> None:
+        """Promotes the index buffers to int64 when `size` indices don't fit
+        into their current data type.
+
+        Parameters
+        ----------
+        size : int
+            Number of nodes or edges to be indexed.
+        """
+        if size <= np.iinfo(self._index_dtype).max:
+            return
+
+        self._index_dtype = np.int64
+        for name in self._INDEX_BUFFERS:
+            buffer = getattr(self, name, None)
+            if buffer is not None:
+                setattr(self, name, buffer.astype(np.int64))
+        self._unfreeze()
+
     def _init_node_buffers(self, n_nodes: int) -> None:
+        self._promote_index_dtype(n_nodes)
         self._empty_nodes: List[int] = list(reversed(range(n_nodes)))
         self._node2edges = np.full(
-            n_nodes, fill_value=_EDGE_EMPTY_PTR, dtype=int
+            n_nodes, fill_value=_EDGE_EMPTY_PTR, dtype=self._index_dtype
         )
-        self._world2buffer = typed.Dict.empty(types.int64, types.int64)
         self._buffer2world = np.full(
-            n_nodes, fill_value=_NODE_EMPTY_PTR, dtype=int
+            n_nodes, fill_value=_NODE_EMPTY_PTR, dtype=np.int64
+        )
+        self._rehash_world2buffer(n_nodes)
+
+    def _rehash_world2buffer(self, n_nodes: int) -> None:
+        """Rebuilds the world to buffer hash table with room for `n_nodes`.
+
+        The table is kept at most half full (including removed rows) so
+        lookups probe only a few rows.
+        """
+        size = 1 << (2 * max(n_nodes, self._ALLOC_MIN) - 1).bit_length()
+        self._world2buffer = np.full(
+            (size, 2), fill_value=_HASH_EMPTY_PTR, dtype=np.int64
+        )
+        self._n_deleted_world2buffer = 0
+
+        (buffer_indices,) = np.nonzero(self._buffer2world != _NODE_EMPTY_PTR)
+        _update_world2buffer(
+            self._world2buffer,
+            self._buffer2world[buffer_indices],
+            buffer_indices,
         )
 
     def _init_edge_buffers(self, n_edges: int) -> None:
-        self._empty_edge_idx = 0 if n_edges > 0 else _EDGE_EMPTY_PTR
+        self._promote_index_dtype(n_edges)
         self._n_edges = 0
-        self._edges_buffer = np.full(
-            n_edges * self._EDGE_DUPLICATION * self._EDGE_SIZE,
-            fill_value=_EDGE_EMPTY_PTR,
-            dtype=int,
+        # structure of arrays, each row is a field of every edge
+        self._edges_buffer = np.empty(
+            (self._EDGE_SIZE, n_edges), dtype=self._index_dtype
         )
-        self._edges_buffer[
-            self._LL_EDGE_POS : -self._EDGE_SIZE : self._EDGE_SIZE
-        ] = np.arange(1, self._EDGE_DUPLICATION * n_edges)
+        self._empty_edges = np.empty(0, dtype=self._index_dtype)
+        self._init_empty_edges(0)
+
+    def _init_empty_edges(self, start: int) -> None:
+        """Initializes the edges buffer from edge `start` as empty edges.
+
+        Only the source node, used to identify empty edges, is written, the
+        remaining fields are set on insertion.
+
+        The empty edges stack is rebuilt with the buffer size, the new edges
+        are placed below the existing empty edges of the stack.
+
+        Parameters
+        ----------
+        start : int
+            First empty edge index.
+        """
+        size = self._edges_buffer.shape[1]
+        n_new = size - start
+        n_empty = start - self._n_edges
+
+        empty_edges = np.empty(size, dtype=self._index_dtype)
+        empty_edges[:n_new] = np.arange(size - 1, start - 1, -1)
+        empty_edges[n_new : n_new + n_empty] = self._empty_edges[:n_empty]
+        self._empty_edges = empty_edges
+
+        self._edges_buffer[0, start:] = _EDGE_EMPTY_PTR
 
     @property
     def ndim(self) -> int:
@@ -365,15 +287,26 @@ class BaseGraph:
                 (size, self._coords.shape[1]), refcheck=False
             )  # zero-filled
 
+        self._promote_index_dtype(size)
+
+        # nodes are the last axis, undirected graphs have two linked lists
         self._node2edges = np.append(
             self._node2edges,
-            np.full(size_diff, fill_value=_EDGE_EMPTY_PTR, dtype=int),
+            np.full(
+                self._node2edges.shape[:-1] + (size_diff,),
+                fill_value=_EDGE_EMPTY_PTR,
+                dtype=self._index_dtype,
+            ),
+            axis=-1,
         )
         self._buffer2world = np.append(
             self._buffer2world,
-            np.full(size_diff, fill_value=_NODE_EMPTY_PTR, dtype=int),
+            np.full(size_diff, fill_value=_NODE_EMPTY_PTR, dtype=np.int64),
+        )
+        # new nodes are placed below the existing empty nodes of the stack
+        self._empty_nodes = (
+            list(reversed(range(prev_size, size))) + self._empty_nodes
         )
-        self._empty_nodes = list(reversed(range(prev_size, size)))
 
     def get_next_valid_indices(self, count: int) -> ArrayLike:
         if count <= 0:
@@ -443,7 +376,9 @@ class BaseGraph:
                     "`coords` cannot be provided for non-spatial graphs."
                 )
 
-        if _contains_keys(self._world2buffer, indices):
+        # numba kernels are compiled for contiguous int64 arrays
+        world_indices = np.ascontiguousarray(indices, dtype=np.int64)
+        if _contains_keys(self._world2buffer, world_indices):
             raise ValueError(
                 f"One of the nodes {indices} are already present in the buffer."
             )
@@ -454,7 +389,9 @@ class BaseGraph:
             )
 
         # flipping since _empty_nodes is a stack
-        buffer_indices = np.flip(self._empty_nodes[-len(indices) :])
+        buffer_indices = np.ascontiguousarray(
+            np.flip(self._empty_nodes[-len(indices) :]), dtype=np.int64
+        )
 
         if coords is not None:
             if indices.shape[0] != coords.shape[0]:
@@ -464,7 +401,14 @@ class BaseGraph:
 
             self._coords[buffer_indices] = coords
 
-        _update_world2buffer(self._world2buffer, indices, buffer_indices)
+        n_hash_rows = (
+            self.n_nodes + len(indices) + self._n_deleted_world2buffer
+        )
+        if 2 * n_hash_rows > len(self._world2buffer):
+            self._rehash_world2buffer(self.n_nodes + len(indices))
+
+        self._unfreeze()
+        _update_world2buffer(self._world2buffer, world_indices, buffer_indices)
         self._empty_nodes = self._empty_nodes[: -len(indices)]
         self._buffer2world[buffer_indices] = indices
 
@@ -473,6 +417,15 @@ class BaseGraph:
     def _get_alloc_size(self, size: int) -> int:
         return int(max(size * self._ALLOC_MULTIPLIER, self._ALLOC_MIN))
 
+    def _get_edges_alloc_size(self, n_edges: int) -> int:
+        """Number of edges to allocate, rounded up to a power of 2.
+
+        The edges buffer size at least doubles when it's reallocated, so
+        incremental insertions copy each edge a constant number of times.
+        """
+        n_edges = max(n_edges, 2 * self.n_allocated_edges, self._ALLOC_MIN)
+        return 1 << (n_edges - 1).bit_length()
+
     def remove_node(self, index: int, is_buffer_domain: bool = False) -> None:
         """Remove node of given `index`, by default it's the world index.
 
@@ -485,8 +438,11 @@ class BaseGraph:
         """
         if is_buffer_domain:
             index = self._buffer2world[index]
-        buffer_index = self._world2buffer.pop(index)
+        (buffer_index,) = self._map_world2buffer(np.atleast_1d(index))
+        self._unfreeze()
         self._remove_incident_edges(buffer_index)
+        _pop_world2buffer(self._world2buffer, int(index))
+        self._n_deleted_world2buffer += 1
         self._buffer2world[buffer_index] = _NODE_EMPTY_PTR
         self._empty_nodes.append(buffer_index)
 
@@ -506,9 +462,8 @@ class BaseGraph:
             New number of edges.
         """
 
-        # augmenting size to match dummy edges
-        size = n_edges * self._EDGE_DUPLICATION
-        prev_size = self.n_allocated_edges * self._EDGE_DUPLICATION
+        size = n_edges
+        prev_size = self.n_allocated_edges
         diff_size = size - prev_size
 
         if diff_size < 0:
@@ -520,35 +475,20 @@ class BaseGraph:
                 f"Tried to realloc to current buffer size ({self.n_allocated_edges})."
             )
 
-        prev_buffer_size = len(self._edges_buffer)
+        self._promote_index_dtype(size)
 
-        self._edges_buffer = np.append(
-            self._edges_buffer,
-            np.full(
-                diff_size * self._EDGE_SIZE,
-                fill_value=_EDGE_EMPTY_PTR,
-                dtype=int,
-            ),
+        # single allocation, existing edges are copied once
+        edges_buffer = np.empty(
+            (self._EDGE_SIZE, size), dtype=self._index_dtype
         )
-
-        # fills empty edges ptr
-        self._edges_buffer[
-            prev_buffer_size
-            + self._LL_EDGE_POS : -self._EDGE_SIZE : self._EDGE_SIZE
-        ] = np.arange(prev_size + 1, size)
-
-        # appends existing empty edges linked list to the end of the new list
-        self._edges_buffer[
-            self._LL_EDGE_POS - self._EDGE_SIZE
-        ] = self._empty_edge_idx
-        self._empty_edge_idx = prev_size
+        edges_buffer[:, :prev_size] = self._edges_buffer
+        self._edges_buffer = edges_buffer
+        self._init_empty_edges(prev_size)
 
     @property
     def n_allocated_edges(self) -> int:
         """Number of total allocated edges."""
-        return len(self._edges_buffer) // (
-            self._EDGE_DUPLICATION * self._EDGE_SIZE
-        )
+        return self._edges_buffer.shape[1]
 
     @property
     def n_empty_edges(self) -> int:
@@ -605,6 +545,11 @@ class BaseGraph:
 
         return edges
 
+    @abstractmethod
+    def _add_edge(self, src_node: int, tgt_node: int) -> None:
+        """Abstract method, adds a single edge given its nodes world indices."""
+        raise NotImplementedError
+
     @abstractmethod
     def _add_edges(self, edges: np.ndarray) -> None:
         """Abstract method.
@@ -624,13 +569,34 @@ class BaseGraph:
             A list of 2-dimensional tuples or an Nx2 array with a pair of
             node indices.
         """
+        if (
+            isinstance(edges, (tuple, list))
+            or (isinstance(edges, np.ndarray) and edges.ndim == 1)
+        ) and (
+            len(edges) == 2
+            and all(
+                isinstance(node, (int, np.integer))
+                and not isinstance(node, (bool, np.bool_))
+                for node in edges
+            )
+        ):
+            # single edge fast path, nodes are mapped inside the kernel
+            if self.n_empty_edges == 0:
+                self._realloc_edges_buffers(
+                    self._get_edges_alloc_size(self.n_edges + 1)
+                )
+            self._unfreeze()
+            self._add_edge(int(edges[0]), int(edges[1]))
+            return
+
         edges = self._validate_edges(edges)
 
         if self.n_empty_edges < len(edges):
             self._realloc_edges_buffers(
-                self._get_alloc_size(self.n_edges + len(edges))
+                self._get_edges_alloc_size(self.n_edges + len(edges))
             )
 
+        self._unfreeze()
         self._add_edges(self._map_world2buffer(edges))
 
     @abstractmethod
@@ -648,6 +614,7 @@ class BaseGraph:
         """
         edges = self._validate_edges(edges)
         edges = self._map_world2buffer(edges)
+        self._unfreeze()
         self._remove_edges(edges)
 
     def _map_world2buffer(self, world_idx: np.ndarray) -> np.ndarray:
@@ -657,53 +624,126 @@ class BaseGraph:
         """
         shape = world_idx.shape
         buffer_idx = _vmap_world2buffer(
-            self._world2buffer, world_idx.reshape(-1)
+            self._world2buffer,
+            np.ascontiguousarray(world_idx.reshape(-1), dtype=np.int64),
         )
         return buffer_idx.reshape(shape)
 
+    def _freeze(
+        self,
+        node2edges: np.ndarray,
+        iterate_edges_func: Callable[
+            [np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+            Tuple[np.ndarray, np.ndarray],
+        ],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the CSR representation of the `node2edges` linked lists.
+
+        It's computed once and reused until the graph is modified.
+
+        Parameters
+        ----------
+        node2edges : np.ndarray
+            Mapping from node indices to edge buffer indices -- head of edges linked list.
+        iterate_edges_func : [np.ndarray, np.ndarray, np.ndarray, np.ndarray] -> Tuple[np.ndarray, np.ndarray]
+            Function that iterates the edges of the nodes world indices from
+            `world2buffer`, `world_idx`, `node2edges` and `edges_buffer`.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Flattened edges (`indices`) and nodes pointers (`indptr`), the
+            edges of the node at buffer index `u` are at
+            `indices[indptr[u] : indptr[u + 1]]`.
+        """
+        if iterate_edges_func not in self._frozen_edges:
+            buffer_indices = np.flatnonzero(self.initialized_buffer_mask())
+            indices, offsets = iterate_edges_func(
+                self._world2buffer,
+                self._buffer2world[buffer_indices],
+                node2edges,
+                self._edges_buffer,
+            )
+            # empty nodes have no edges
+            indptr = np.zeros(self.n_allocated_nodes + 1, dtype=np.int64)
+            indptr[buffer_indices + 1] = np.diff(offsets)
+            self._frozen_edges[iterate_edges_func] = (
+                indices,
+                np.cumsum(indptr),
+            )
+        return self._frozen_edges[iterate_edges_func]
+
+    def _unfreeze(self) -> None:
+        """Discards the CSR edges, must be called when the graph is modified."""
+        self._frozen_edges.clear()
+
     def _iterate_edges(
         self,
-        node_world_indices: ArrayLike,
+        node_world_indices: Optional[ArrayLike],
         node2edges: np.ndarray,
         iterate_edges_func: Callable[
-            [np.ndarray, np.ndarray], List[np.ndarray]
+            [np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+            Tuple[np.ndarray, np.ndarray],
         ],
-    ) -> List[List]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Helper function to iterate over edges and return buffer indices.
 
+        When every node is queried, or the graph wasn't modified since then,
+        the edges are read from their CSR representation instead of the
+        linked lists.
+
         Parameters
         ----------
         node_world_indices : ArrayLike
-            Nodes world indices.
+            Nodes world indices, all nodes when None.
         node2edges : np.ndarray
-            Mapping from node indices to edge buffer indices -- head of edges linked list.
-        iterate_edges_func : [np.ndarray, np.ndarray] -> List[np.ndarray]
-            Function that iterates the edges from `edges_ptr_indices` and
-            `edges_buffer`.
+            Mapping from node indices (last axis) to edge buffer indices -- head of edges linked list.
+        iterate_edges_func : [np.ndarray, np.ndarray, np.ndarray, np.ndarray] -> Tuple[np.ndarray, np.ndarray]
+            Function that iterates the edges of the nodes world indices from
+            `world2buffer`, `world_idx`, `node2edges` and `edges_buffer`.
 
         Returns
         -------
-        List[List]
-            List of Lists of length 2 * N_i, where N_i is the number of edges
-            at the ith node.
+        Tuple[np.ndarray, np.ndarray]
+            Flat array of nodes buffer indices, adjacent nodes are at indices
+            (k, k+1) such that k is even, and the offsets of each queried node,
+            its edges are at `flat[offsets[i] : offsets[i + 1]]`.
         """
+        is_frozen = iterate_edges_func in self._frozen_edges
+        if node_world_indices is None or is_frozen:
+            indices, indptr = self._freeze(node2edges, iterate_edges_func)
+            if node_world_indices is None:
+                # nodes in buffer order, empty nodes have no edges so the
+                # CSR edges are already contiguous and only offsets are needed
+                buffer_indices = np.flatnonzero(self.initialized_buffer_mask())
+                return indices, np.concatenate(
+                    ([0], indptr[buffer_indices + 1])
+                )
+            buffer_indices = self._map_world2buffer(
+                self._validate_nodes(node_world_indices)
+            )
+            return _gather_csr(indices, indptr, buffer_indices)
+
         node_world_indices = self._validate_nodes(node_world_indices)
 
-        flat_edges = iterate_edges_func(
-            node2edges[self._map_world2buffer(node_world_indices)],
+        return iterate_edges_func(
+            self._world2buffer,
+            np.ascontiguousarray(node_world_indices, dtype=np.int64),
+            node2edges,
             self._edges_buffer,
         )
-        return flat_edges
 
     def _iterate_edges_generic(
         self,
         node_world_indices: ArrayLike,
         node2edges: np.ndarray,
         iterate_edges_func: Callable[
-            [np.ndarray, np.ndarray], List[np.ndarray]
+            [np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+            Tuple[np.ndarray, np.ndarray],
         ],
         mode: str,
-    ) -> Union[List[np.ndarray], np.ndarray]:
+        flat: bool = False,
+    ) -> Union[List[np.ndarray], np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         """Iterate over any kind of edges and return their world indices.
 
         Parameters
@@ -712,12 +752,15 @@ class BaseGraph:
             Nodes world indices.
         node2edges : np.ndarray
             Mapping from node indices to edge buffer indices -- head of edges linked list.
-        iterate_edges_func : [np.ndarray, np.ndarray] -> List[np.ndarray]
-            Function that iterates the edges from `edges_ptr_indices` and
-            `edges_buffer`.
+        iterate_edges_func : [np.ndarray, np.ndarray, np.ndarray, np.ndarray] -> Tuple[np.ndarray, np.ndarray]
+            Function that iterates the edges of the nodes world indices from
+            `world2buffer`, `world_idx`, `node2edges` and `edges_buffer`.
         mode : str
             Type of data queried from the edges. For example, `indices` or
             `coords`.
+        flat : bool
+            When true the edges of every node are returned as a single array
+            and its offsets instead of a list of arrays.
 
         Returns
         -------
@@ -725,31 +768,25 @@ class BaseGraph:
             List of N_i x 2 x D arrays, where N_i is the number of edges at
             the ith node.  D is the dimensionality of `coords` when
             mode == `coords` and it's ignored when mode == `indices`.
+            When `flat` it's a single (sum N_i) x 2 x D array and the offsets
+            of each node, the ith node edges are at `edges[offsets[i] : offsets[i + 1]]`.
         """
         if mode.lower() == 'coords' and self._coords is None:
             raise ValueError(
                 "`coords` mode only available for spatial graphs."
             )
 
-        flat_edges = self._iterate_edges(
+        flat_edges, offsets = self._iterate_edges(
             node_world_indices, node2edges, iterate_edges_func
         )
+        # offsets of each node edges instead of nodes
+        offsets = offsets // 2
 
         if mode.lower() == 'indices':
-            edges_data = [
-                self._buffer2world[e].reshape(-1, 2)
-                if len(e) > 0
-                else np.empty((0, 2))
-                for e in flat_edges
-            ]
+            edges_data = self._buffer2world[flat_edges].reshape(-1, 2)
         elif mode.lower() == 'coords':
             ndim = self._coords.shape[1]
-            edges_data = [
-                self._coords[e].reshape(-1, 2, ndim)
-                if len(e) > 0
-                else np.empty((0, 2, ndim))
-                for e in flat_edges
-            ]
+            edges_data = self._coords[flat_edges].reshape(-1, 2, ndim)
         # NOTE: here `mode` could also query the edges features.
         # Not implemented yet.
         else:
@@ -759,15 +796,23 @@ class BaseGraph:
                 f"expected {modes}."
             )
 
-        if len(edges_data) == 1:
-            return edges_data[0]
-        else:
+        if flat:
+            return edges_data, offsets
+
+        if len(offsets) == 1:
+            return []
+        elif len(offsets) == 2:
             return edges_data
+        else:
+            return np.split(edges_data, offsets[1:-1])
 
     @abstractmethod
     def get_edges(
-        self, nodes: Optional[ArrayLike] = None, mode: str = 'indices'
-    ) -> Union[List[np.ndarray], np.ndarray]:
+        self,
+        nodes: Optional[ArrayLike] = None,
+        mode: str = 'indices',
+        flat: bool = False,
+    ) -> Union[List[np.ndarray], np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         raise NotImplementedError
 
     def get_edges_buffers(
@@ -775,10 +820,11 @@ class BaseGraph:
     ) -> Tuple[np.ndarray, np.ndarray]:
         """Return valid edges in buffer or world domain.
 
-        Return the indices (buffer domain) and the (source, target) values
-        (world domain) of all valid edges.
+        Return the edges indices (buffer domain) and the (source, target)
+        values (world domain) of all valid edges.
 
-        Undirected edges are not duplicated.
+        Undirected edges are not duplicated, their nodes are sorted by buffer
+        index.
 
         This function is useful for loading the data for visualization.
 
@@ -792,13 +838,10 @@ class BaseGraph:
         Tuple[np.ndarray, np.ndarray]
             Buffer indices (buffer domain) and (source, target) (world domain by default).
         """
-        unique_edge_size = self._EDGE_SIZE * self._EDGE_DUPLICATION
-        buffer_size = len(self._edges_buffer)
-        indices = np.arange(0, buffer_size, unique_edge_size)
+        indices = np.arange(self._edges_buffer.shape[1])
 
-        # reshaping such that each row is (source id, target id, ...)
-        buffer = self._edges_buffer.reshape((-1, unique_edge_size))
-        edges = buffer[:, :2]  # (source, target)
+        # transposing such that each row is (source id, target id)
+        edges = self._edges_buffer[:2].T
 
         valid = edges[:, 0] != _EDGE_EMPTY_PTR
 